@@ -1,34 +1,113 @@
+import orjson
 import requests
+import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # ================
 # CONFIG / CONSTANTS
 # ================
 TOKEN_PROFILES_URL = "https://api.dexscreener.com/token-profiles/latest/v1"
-TOKEN_PAIRS_URL_TEMPLATE = "https://api.dexscreener.com/token-pairs/v1/solana/{tokenAddress}"
+TOKEN_PAIRS_URL_PREFIX = "https://api.dexscreener.com/token-pairs/v1/solana/"  # + tokenAddress
 
 # Example thresholds
 MIN_VOLUME_USD = 30000        # Must have at least $30k 24h volume
 MIN_LIQUIDITY_USD = 1000    # Must have at least $1k in liquidity
 MIN_AGE_SECONDS = 86400       # Must be at least 1 day old
 
+# Concurrency / rate limiting for the per-token pair lookups
+MAX_FETCH_WORKERS = 16
+PAIRS_REQUESTS_PER_MINUTE = 300   # Dexscreener limit for token-pairs (see apis.txt)
+
+# Shared HTTP session: every call goes to api.dexscreener.com, so keep-alive
+# connections are reused instead of paying a new TCP+TLS handshake each time.
+# The pool holds one connection per fetch worker so threads never wait on it.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=MAX_FETCH_WORKERS,
+    pool_block=True,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504]),
+))
+_SESSION.headers.update({
+    "Accept": "application/json",
+    "User-Agent": "solana-scanner/1.0",
+    "Connection": "keep-alive",
+})
+
 # ================
 # HELPERS
 # ================
 
+class _TokenBucket:
+    """
+    Thread-safe token bucket: allows bursts of up to `capacity` requests,
+    then paces callers to `rate` requests per second.
+    """
+    def __init__(self, capacity, rate):
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = float(capacity)
+        self.last_refill = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+            self.last_refill = now
+            # Reserve a token even if we have to wait for it, so concurrent
+            # callers queue up behind each other instead of all sleeping the same amount.
+            wait = (1 - self.tokens) / self.rate if self.tokens < 1 else 0
+            self.tokens -= 1
+        if wait:
+            time.sleep(wait)
+
+_PAIRS_RATE_LIMITER = _TokenBucket(capacity=PAIRS_REQUESTS_PER_MINUTE, rate=PAIRS_REQUESTS_PER_MINUTE / 60)
+
+
+# Conditional-request state per URL: last ETag seen and the body parsed from that response
+_etags = {}
+_bodies = {}
+_etag_lock = threading.Lock()
+
+def _get_json(url):
+    """
+    GETs `url` and returns its parsed JSON body. If an ETag is known for the URL it
+    is sent as If-None-Match; a 304 reply returns the previously parsed body, so
+    nothing is downloaded or parsed. Raises on HTTP and JSON errors.
+    """
+    with _etag_lock:
+        etag = _etags.get(url)
+        cached_body = _bodies.get(url)
+    headers = {"If-None-Match": etag} if etag else None
+    resp = _SESSION.get(url, headers=headers, timeout=10)
+    if etag and resp.status_code == 304:
+        return cached_body
+    resp.raise_for_status()
+    body = orjson.loads(resp.content)
+    new_etag = resp.headers.get("ETag")
+    if new_etag:
+        with _etag_lock:
+            _etags[url] = new_etag
+            _bodies[url] = body
+    return body
+
+
 def fetch_solana_token_profiles():
     """
     Fetches the latest token profiles from Dexscreener and filters
     only those that belong to 'solana'.
     """
     try:
-        response = requests.get(TOKEN_PROFILES_URL, timeout=10)
-        response.raise_for_status()
-
         # Dexscreener returns a list of token profile objects (for multiple chains).
-        all_profiles = response.json()
+        all_profiles = _get_json(TOKEN_PROFILES_URL)
 
-        # Filter out only the Solana profiles:
+        # Filter out only the Solana profiles (the list holds references to the
+        # parsed dicts, not copies, so this adds little on top of the parsed payload):
         solana_profiles = [profile for profile in all_profiles if profile.get("chainId") == "solana"]
 
         print(f"Total token profiles returned (all chains): {len(all_profiles)}")
@@ -36,7 +115,7 @@ def fetch_solana_token_profiles():
 
         return solana_profiles
 
-    except requests.exceptions.RequestException as e:
+    except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
         print(f"[ERROR] Could not fetch Solana token profiles: {e}")
         return []
 
@@ -50,40 +129,28 @@ def fetch_token_pairs_for_solana_token(token_address):
       GET https://api.dexscreener.com/token-pairs/v1/solana/{tokenAddress}
     """
     try:
-        url = TOKEN_PAIRS_URL_TEMPLATE.format(tokenAddress=token_address)
-        resp = requests.get(url, timeout=10)
-        resp.raise_for_status()
-        return resp.json()  # Usually a list of pairs
-    except requests.exceptions.RequestException as e:
+        url = TOKEN_PAIRS_URL_PREFIX + token_address
+        _PAIRS_RATE_LIMITER.acquire()
+        return _get_json(url)  # Usually a list of pairs
+    except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
         print(f"[ERROR] Failed to fetch pairs for {token_address}: {e}")
         return []
 
 
 def passes_filter_criteria(pair_data,
+                           cutoff_ms,
                            min_volume=MIN_VOLUME_USD,
-                           min_liquidity=MIN_LIQUIDITY_USD,
-                           min_age=MIN_AGE_SECONDS):
+                           min_liquidity=MIN_LIQUIDITY_USD):
     """
     Checks if the given pair_data meets:
       - 24h volume >= min_volume
       - liquidity >= min_liquidity
-      - age >= min_age (in seconds)
+      - created at or before cutoff_ms (epoch milliseconds), i.e. old enough.
+        The caller computes the cutoff once per scan from MIN_AGE_SECONDS.
     """
-    volume_24h = pair_data.get("volume", {}).get("h24", 0)
-    liquidity_usd = pair_data.get("liquidity", {}).get("usd", 0)
-    pair_created_at = pair_data.get("pairCreatedAt", 0)  # Often in milliseconds
-
-    # Convert timestamp from ms to seconds
-    pair_created_at_s = pair_created_at / 1000.0
-    current_ts = time.time()
-    age_in_seconds = current_ts - pair_created_at_s
-
-    if (volume_24h >= min_volume
-        and liquidity_usd >= min_liquidity
-        and age_in_seconds >= min_age):
-        return True
-    else:
-        return False
+    return (pair_data.get("pairCreatedAt", 0) <= cutoff_ms
+            and pair_data.get("volume", {}).get("h24", 0) >= min_volume
+            and pair_data.get("liquidity", {}).get("usd", 0) >= min_liquidity)
 
 
 def filter_solana_coins():
@@ -96,29 +163,38 @@ def filter_solana_coins():
     solana_profiles = fetch_solana_token_profiles()
 
     valid_tokens = []
-
-    for idx, profile in enumerate(solana_profiles, start=1):
-        token_address = profile.get("tokenAddress", "N/A")
-        token_name_url = profile.get("url", "Unknown URL")
-
-        # Retrieve all pairs for this token.
-        pairs_data = fetch_token_pairs_for_solana_token(token_address)
-
-        # Check if *any* of the token's pairs meets the criteria:
-        if any(passes_filter_criteria(pair) for pair in pairs_data):
-            valid_tokens.append(profile)
-
-    # Print or return the valid tokens
-    print(f"\n=== FILTER RESULTS ===")
+    # Pairs created at or before this timestamp (ms) are at least MIN_AGE_SECONDS old
+    cutoff_ms = int((time.time() - MIN_AGE_SECONDS) * 1000)
+
+    # One profile per token address (first one wins), so no token is fetched twice
+    unique_profiles = {}
+    for profile in solana_profiles:
+        token_address = profile.get("tokenAddress")
+        if token_address:
+            unique_profiles.setdefault(token_address, profile)
+
+    # Retrieve all pairs for every token in parallel; the lookups are network-bound.
+    with ThreadPoolExecutor(max_workers=MAX_FETCH_WORKERS) as executor:
+        pairs_per_token = executor.map(fetch_token_pairs_for_solana_token, unique_profiles)
+
+        for profile, pairs_data in zip(unique_profiles.values(), pairs_per_token):
+            # Check if *any* of the token's pairs meets the criteria:
+            if any(passes_filter_criteria(pair, cutoff_ms) for pair in pairs_data):
+                valid_tokens.append(profile)
+
+    # Print or return the valid tokens (built up and written in one go)
+    lines = ["\n=== FILTER RESULTS ==="]
     if not valid_tokens:
-        print("No Solana tokens passed the filter criteria.")
+        lines.append("No Solana tokens passed the filter criteria.")
+        sys.stdout.write("\n".join(lines) + "\n")
         return
 
-    print(f"{len(valid_tokens)} Solana tokens passed the filter criteria:")
+    lines.append(f"{len(valid_tokens)} Solana tokens passed the filter criteria:")
     for idx, vtoken in enumerate(valid_tokens, start=1):
-        print(f"{idx}. Token Address: {vtoken.get('tokenAddress')}")
-        print(f"   URL: {vtoken.get('url')}")
-        print(f"   Description: {vtoken.get('description', '')[:80]}...\n")
+        lines.append(f"{idx}. Token Address: {vtoken.get('tokenAddress')}")
+        lines.append(f"   URL: {vtoken.get('url')}")
+        lines.append(f"   Description: {vtoken.get('description', '')[:80]}...\n")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 if __name__ == "__main__":
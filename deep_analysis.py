@@ -1,5 +1,20 @@
+import sys
 import time
+import sqlite3
+import threading
+import functools
+import numpy as np
+import orjson
 import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from operator import itemgetter
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; batches are scored with plain NumPy without it
+    njit = None
 
 # --------------------------------------------------
 # 1) CONFIG / CONSTANTS
@@ -8,7 +23,10 @@ import requests
 # Dexscreener endpoint for the latest token profiles
 TOKEN_PROFILES_URL = "https://api.dexscreener.com/token-profiles/latest/v1"
 # Dexscreener endpoint for token pairs
-TOKEN_PAIRS_URL_TEMPLATE = "https://api.dexscreener.com/token-pairs/v1/solana/{tokenAddress}"
+TOKEN_PAIRS_URL_PREFIX = "https://api.dexscreener.com/token-pairs/v1/solana/"  # + tokenAddress
+# Dexscreener endpoint returning pairs for up to MAX_TOKENS_PER_REQUEST comma-separated addresses
+TOKENS_BATCH_URL_PREFIX = "https://api.dexscreener.com/tokens/v1/solana/"
+MAX_TOKENS_PER_REQUEST = 30
 
 # Example thresholds (tweak as needed)
 MIN_LIQUIDITY_USD = 10000     # must have at least $10k liquidity
@@ -24,12 +42,102 @@ WEIGHT_HOLDER_DISTRIB = 0.1  # or negative weighting if top holder % is large
 
 # Minimum final score to pass (example)
 MIN_SCORE_THRESHOLD = 2000
+# Bonus added by compute_historical_bonus when volume is trending up
+HISTORICAL_BONUS = 100
+# Upper bound on a realistic 24h tx count, used to skip tokens that can't reach the threshold
+MAX_PLAUSIBLE_TX_COUNT = 100000
+
+# Batches of at least this many tokens are scored with the numba kernel (if installed)
+NUMBA_MIN_BATCH = 256
+
+# Local SQLite store for daily volume/liquidity snapshots
+SNAPSHOT_DB_PATH = "snapshots.db"
+HISTORY_DAYS = 7
+
+# Number of concurrent Dexscreener pair lookups
+MAX_FETCH_WORKERS = 16
+# Dexscreener rate limit for the token-pairs/tokens endpoints (see apis.txt)
+PAIRS_REQUESTS_PER_MINUTE = 300
+
+# Shared HTTP session: every call goes to api.dexscreener.com, so keep-alive
+# connections are reused instead of paying a new TCP+TLS handshake each time.
+# One host pool with one connection per worker; pool_block makes a thread wait
+# for a free keep-alive connection rather than opening a throwaway socket.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=MAX_FETCH_WORKERS,
+    pool_block=True,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504]),
+))
+_SESSION.headers.update({
+    "Accept": "application/json",
+    "User-Agent": "solana-scanner/1.0",
+    "Connection": "keep-alive",
+})
+
+
+# --------------------------------------------------
+# 2) CACHING
+# --------------------------------------------------
+
+_MISSING = object()
+
+class TTLCache:
+    """
+    Small thread-safe mapping whose entries expire `ttl` seconds after being stored.
+    When full, expired entries are dropped first, then the oldest insert.
+    """
+    def __init__(self, ttl, maxsize=4096):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.entries = {}
+        self.lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self.lock:
+            entry = self.entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+        return default
+
+    def set(self, key, value):
+        now = time.monotonic()
+        with self.lock:
+            if key not in self.entries and len(self.entries) >= self.maxsize:
+                for stale in [k for k, (expires, _) in self.entries.items() if expires <= now]:
+                    del self.entries[stale]
+                if len(self.entries) >= self.maxsize:
+                    del self.entries[next(iter(self.entries))]
+            self.entries[key] = (now + self.ttl, value)
+
+def ttl_cache(ttl, maxsize=4096):
+    """
+    Memoizes a single-argument function (keyed on e.g. token_address) for `ttl` seconds.
+    Exceptions are not cached, so a failed lookup is retried on the next call.
+    The underlying TTLCache is exposed as `func.cache`.
+    """
+    def decorator(func):
+        cache = TTLCache(ttl, maxsize)
+
+        @functools.wraps(func)
+        def wrapper(key):
+            value = cache.get(key, _MISSING)
+            if value is _MISSING:
+                value = func(key)
+                cache.set(key, value)
+            return value
+
+        wrapper.cache = cache
+        return wrapper
+    return decorator
 
 
 # --------------------------------------------------
-# 2) PLACEHOLDER FUNCTIONS FOR ADDITIONAL DATA
+# 3) PLACEHOLDER FUNCTIONS FOR ADDITIONAL DATA
 # --------------------------------------------------
 
+@ttl_cache(ttl=300)
 def fetch_holder_distribution(token_address):
     """
     Returns data about token holder distribution:
@@ -56,6 +164,7 @@ def fetch_holder_distribution(token_address):
     }
     return data
 
+@ttl_cache(ttl=600)
 def check_liquidity_lock(token_address):
     """
     Returns True/False indicating whether the token's liquidity is locked.
@@ -64,6 +173,7 @@ def check_liquidity_lock(token_address):
     # Placeholder always returns True for demonstration
     return True
 
+@ttl_cache(ttl=60)
 def fetch_transaction_count(token_address):
     """
     Returns the 24h transaction count for the token.
@@ -73,62 +183,184 @@ def fetch_transaction_count(token_address):
     # E.g., combined buys + sells if you have that data from Dexscreener
     return 500
 
+_snapshot_conn = None
+_snapshot_lock = threading.Lock()
+
+def _get_snapshot_conn():
+    """
+    Opens (once) the snapshot database in WAL mode and creates the table if needed.
+    Callers must hold _snapshot_lock.
+    """
+    global _snapshot_conn
+    if _snapshot_conn is None:
+        conn = sqlite3.connect(SNAPSHOT_DB_PATH, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("CREATE TABLE IF NOT EXISTS snap("
+                     "token TEXT, ts INTEGER, vol REAL, liq REAL, PRIMARY KEY(token, ts))")
+        _snapshot_conn = conn
+    return _snapshot_conn
+
 def fetch_historical_data(token_address):
     """
-    Could return a list of daily volume/liquidity for the past 7 days, for example:
+    Returns up to HISTORY_DAYS daily snapshots for the token, oldest first:
       [
         {"timestamp": 1690000000, "volume": 35000, "liquidity": 12000},
         {"timestamp": 1690086400, "volume": 42000, "liquidity": 15000},
         ...
       ]
-    Or retrieve from your DB if you're storing historical snapshots.
+    Snapshots are stored locally by record_snapshots() at the end of each scan,
+    so this is a single indexed read rather than a network call.
     """
-    # Placeholder: random or static example
-    historical = [
-        {"timestamp": 1690000000, "volume": 30000, "liquidity": 9000},
-        {"timestamp": 1690086400, "volume": 35000, "liquidity": 10000},
-        {"timestamp": 1690172800, "volume": 40000, "liquidity": 11000},
-    ]
-    return historical
+    with _snapshot_lock:
+        rows = _get_snapshot_conn().execute(
+            "SELECT ts, vol, liq FROM snap WHERE token = ? ORDER BY ts DESC LIMIT ?",
+            (token_address, HISTORY_DAYS),
+        ).fetchall()
+    return [{"timestamp": day * 86400, "volume": vol, "liquidity": liq}
+            for day, vol, liq in reversed(rows)]
+
+def record_snapshots(snapshots):
+    """
+    Stores today's (token_address, volume_24h, liquidity_usd) rows in one transaction.
+    Re-running on the same day overwrites that day's row.
+    """
+    day = int(time.time() // 86400)
+    rows = [(token_address, day, volume, liquidity) for token_address, volume, liquidity in snapshots]
+    if not rows:
+        return
+    with _snapshot_lock:
+        conn = _get_snapshot_conn()
+        with conn:
+            conn.execute("BEGIN")
+            conn.executemany("INSERT OR REPLACE INTO snap VALUES (?, ?, ?, ?)", rows)
 
 
 # --------------------------------------------------
-# 3) HELPER FUNCTIONS FOR DEXSCREENER
+# 4) HELPER FUNCTIONS FOR DEXSCREENER
 # --------------------------------------------------
 
+class _TokenBucket:
+    """
+    Thread-safe token bucket: allows bursts of up to `capacity` requests,
+    then paces callers to `rate` requests per second.
+    """
+    def __init__(self, capacity, rate):
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = float(capacity)
+        self.last_refill = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+            self.last_refill = now
+            # Reserve a token even if we have to wait for it, so concurrent
+            # callers queue up behind each other instead of all sleeping the same amount.
+            wait = (1 - self.tokens) / self.rate if self.tokens < 1 else 0
+            self.tokens -= 1
+        if wait:
+            time.sleep(wait)
+
+_PAIRS_RATE_LIMITER = _TokenBucket(capacity=PAIRS_REQUESTS_PER_MINUTE, rate=PAIRS_REQUESTS_PER_MINUTE / 60)
+
+# Conditional-request state per URL: (ETag, parsed body) of the last 200 response
+_CONDITIONAL_CACHE = TTLCache(ttl=3600, maxsize=1024)
+
+def _get_json(url):
+    """
+    GETs `url` and returns its parsed JSON body. If an ETag is known for the URL it
+    is sent as If-None-Match; a 304 reply returns the previously parsed body, so
+    nothing is downloaded or parsed. Raises on HTTP and JSON errors.
+    """
+    cached = _CONDITIONAL_CACHE.get(url)
+    headers = {"If-None-Match": cached[0]} if cached else None
+    resp = _SESSION.get(url, headers=headers, timeout=10)
+    if cached and resp.status_code == 304:
+        return cached[1]
+    resp.raise_for_status()
+    body = orjson.loads(resp.content)
+    etag = resp.headers.get("ETag")
+    if etag:
+        _CONDITIONAL_CACHE.set(url, (etag, body))
+    return body
+
 def fetch_solana_token_profiles():
     """
     Fetch the latest token profiles from Dexscreener and filter for Solana.
     """
     try:
-        response = requests.get(TOKEN_PROFILES_URL, timeout=10)
-        response.raise_for_status()
-        all_profiles = response.json()
-    except requests.RequestException as e:
+        all_profiles = _get_json(TOKEN_PROFILES_URL)
+    except (requests.RequestException, orjson.JSONDecodeError) as e:
         print(f"[ERROR] Could not fetch token profiles: {e}")
         return []
 
-    # Filter to only Solana
+    # Filter to only Solana (references into the parsed payload, no copies)
     solana_profiles = [p for p in all_profiles if p.get("chainId") == "solana"]
     return solana_profiles
 
+@ttl_cache(ttl=60)
+def _fetch_pairs_cached(token_address):
+    url = TOKEN_PAIRS_URL_PREFIX + token_address
+    _PAIRS_RATE_LIMITER.acquire()
+    return _get_json(url)  # Usually a list of pairs
+
 def fetch_pairs_for_token(token_address):
     """
     Retrieves pool/pair data for a given Solana token address from Dexscreener,
-    which includes liquidity, volume, etc.
+    which includes liquidity, volume, etc. Results are cached for 60 seconds.
     """
-    url = TOKEN_PAIRS_URL_TEMPLATE.format(tokenAddress=token_address)
     try:
-        resp = requests.get(url, timeout=10)
-        resp.raise_for_status()
-        return resp.json()  # Usually a list of pairs
-    except requests.RequestException as e:
+        return _fetch_pairs_cached(token_address)
+    except (requests.RequestException, orjson.JSONDecodeError) as e:
         print(f"[ERROR] Failed to fetch pairs for {token_address}: {e}")
         return []
 
+def fetch_pairs_batch(token_addresses):
+    """
+    Retrieves pair data for several Solana tokens, MAX_TOKENS_PER_REQUEST addresses
+    per request, and returns {token_address: [pairs...]}. A pair is attributed to every
+    requested token it contains (base or quote). Addresses already in the pair
+    cache are served from it; only the rest are requested.
+    """
+    cache = _fetch_pairs_cached.cache
+    result = {}
+    missing = []
+    for token_address in token_addresses:
+        pairs = cache.get(token_address, _MISSING)
+        if pairs is _MISSING:
+            missing.append(token_address)
+        else:
+            result[token_address] = pairs
+    if not missing:
+        return result
+
+    for start in range(0, len(missing), MAX_TOKENS_PER_REQUEST):
+        chunk = missing[start:start + MAX_TOKENS_PER_REQUEST]
+        url = TOKENS_BATCH_URL_PREFIX + ",".join(chunk)
+        try:
+            _PAIRS_RATE_LIMITER.acquire()
+            pairs = _get_json(url)
+        except (requests.RequestException, orjson.JSONDecodeError) as e:
+            print(f"[ERROR] Failed to fetch pairs for {len(chunk)} tokens: {e}")
+            result.update((token_address, []) for token_address in chunk)
+            continue
+
+        grouped = {token_address: [] for token_address in chunk}
+        for pair in pairs:
+            for side in ("baseToken", "quoteToken"):
+                token_pairs = grouped.get(pair.get(side, {}).get("address"))
+                if token_pairs is not None:
+                    token_pairs.append(pair)
+        for token_address, token_pairs in grouped.items():
+            cache.set(token_address, token_pairs)
+        result.update(grouped)
+    return result
+
 
 # --------------------------------------------------
-# 4) SCORING / ANALYSIS
+# 5) SCORING / ANALYSIS
 # --------------------------------------------------
 
 def compute_token_score(volume_24h, liquidity_usd, tx_count, top_holder_pct, historical_data=None):
@@ -140,6 +372,9 @@ def compute_token_score(volume_24h, liquidity_usd, tx_count, top_holder_pct, his
             - (WEIGHT_HOLDER_DISTRIB * top_holder_pct if we consider big whales negative)
 
     Then you can adjust the result based on historical trends (volume or liquidity growth, etc.).
+
+    The metric arguments may also be NumPy arrays, in which case a whole batch
+    of tokens is scored at once (historical_data only applies to the scalar case).
     """
     base_score = (
         (WEIGHT_LIQUIDITY * liquidity_usd) +
@@ -163,16 +398,94 @@ def compute_historical_bonus(historical_data):
     """
     if len(historical_data) < 2:
         return 0
-    volumes = [day["volume"] for day in historical_data]
-    if volumes[-1] > volumes[0]:
-        return 100
+    if historical_data[-1]["volume"] > historical_data[0]["volume"]:
+        return HISTORICAL_BONUS
     return 0
 
+if njit is not None:
+    @njit(fastmath=True, cache=True)
+    def _score_batch_kernel(volumes, liquidities, tx_counts, top_holder_pcts, bonuses):
+        scores = np.empty(volumes.shape[0])
+        for i in range(volumes.shape[0]):
+            scores[i] = (
+                (WEIGHT_LIQUIDITY * liquidities[i]) +
+                (WEIGHT_VOLUME    * volumes[i]) +
+                (WEIGHT_TX_COUNT  * tx_counts[i]) -
+                (WEIGHT_HOLDER_DISTRIB * top_holder_pcts[i]) +
+                bonuses[i]
+            )
+        return scores
+
+def score_token_batch(volumes, liquidities, tx_counts, top_holder_pcts, bonuses):
+    """
+    Scores a batch of tokens given float64 arrays of their metrics and historical bonuses.
+    Large batches go through a fused numba kernel when numba is installed;
+    otherwise (or for small batches, where JIT dispatch isn't worth it) NumPy is used.
+    """
+    if njit is not None and len(volumes) >= NUMBA_MIN_BATCH:
+        return _score_batch_kernel(volumes, liquidities, tx_counts, top_holder_pcts, bonuses)
+    return compute_token_score(volumes, liquidities, tx_counts, top_holder_pcts) + bonuses
+
 
 # --------------------------------------------------
-# 5) MAIN FILTERING LOGIC
+# 6) MAIN FILTERING LOGIC
 # --------------------------------------------------
 
+_holder_pct = itemgetter("percentage")
+
+def evaluate_token(token_address, volume_24h, liquidity_usd):
+    """
+    Runs the threshold checks for a token, given the volume/liquidity of its best pair.
+    The cheap in-memory checks run first so holder/lock/historical lookups only
+    happen for tokens that can still pass. Returns the token's metrics (to be
+    scored in batch) or None if it fails a check.
+    """
+    # BASIC THRESHOLD CHECKS (cheapest first, so the lookups below only run for survivors)
+    if liquidity_usd < MIN_LIQUIDITY_USD:
+        return None  # fails liquidity
+
+    # Best score this token could reach with a maximal tx count, no whales and the bonus
+    partial_score = (WEIGHT_LIQUIDITY * liquidity_usd) + (WEIGHT_VOLUME * volume_24h)
+    if partial_score + (WEIGHT_TX_COUNT * MAX_PLAUSIBLE_TX_COUNT) + HISTORICAL_BONUS < MIN_SCORE_THRESHOLD:
+        return None  # can't reach the score threshold
+
+    # transaction count
+    tx_count_24h = fetch_transaction_count(token_address)
+    if tx_count_24h < MIN_TX_COUNT_24H:
+        return None  # fails tx count
+    partial_score += WEIGHT_TX_COUNT * tx_count_24h
+    if partial_score + HISTORICAL_BONUS < MIN_SCORE_THRESHOLD:
+        return None  # can't reach the score threshold
+
+    # DISTRIBUTION & LIQUIDITY LOCK
+    holder_info = fetch_holder_distribution(token_address)
+    top_holders = holder_info.get("topHolders", [])
+    if top_holders:
+        max_holder_pct = max(map(_holder_pct, top_holders))
+        if max_holder_pct > TOP_HOLDER_MAX_PERCENT:
+            return None  # fails top-holder distribution
+    else:
+        max_holder_pct = 0
+
+    # liquidity lock
+    if REQUIRED_LIQUIDITY_LOCK and not check_liquidity_lock(token_address):
+        return None  # fails liquidity lock
+
+    # HISTORICAL DATA
+    base_score = partial_score - (WEIGHT_HOLDER_DISTRIB * max_holder_pct)
+    if base_score + HISTORICAL_BONUS < MIN_SCORE_THRESHOLD:
+        return None  # even the historical bonus can't lift it over the threshold
+    historical_data = fetch_historical_data(token_address)
+
+    return {
+        "tokenAddress": token_address,
+        "volume_24h": volume_24h,
+        "liquidity_usd": liquidity_usd,
+        "tx_count_24h": tx_count_24h,
+        "top_holder_pct": max_holder_pct,
+        "historical_bonus": compute_historical_bonus(historical_data) if historical_data else 0,
+    }
+
 def advanced_filter_solana_tokens():
     """
     1. Fetch the latest Solana tokens from Dexscreener.
@@ -188,73 +501,80 @@ def advanced_filter_solana_tokens():
     solana_profiles = fetch_solana_token_profiles()
     print(f"Found {len(solana_profiles)} Solana token profiles.")
 
+    # Unique, non-empty addresses (in profile order) so no token is fetched twice
+    token_addresses = list(dict.fromkeys(p.get("tokenAddress", "") for p in solana_profiles))
+    token_addresses = [addr for addr in token_addresses if addr]
+
+    candidates = []
+    snapshots = []
+
+    # Pair lookups are pure network I/O: request them MAX_TOKENS_PER_REQUEST tokens
+    # at a time and fan the batches out across a thread pool. Each batch is
+    # evaluated as soon as it arrives, overlapping the filtering below with the
+    # lookups still in flight.
+    batches = [token_addresses[i:i + MAX_TOKENS_PER_REQUEST]
+               for i in range(0, len(token_addresses), MAX_TOKENS_PER_REQUEST)]
+    with ThreadPoolExecutor(max_workers=MAX_FETCH_WORKERS) as executor:
+        futures = [executor.submit(fetch_pairs_batch, batch) for batch in batches]
+
+        for future in as_completed(futures):
+            for token_address, pairs in future.result().items():
+                if not pairs:
+                    # No pair data => skip
+                    continue
+
+                # We'll assume we only need to evaluate the "primary" or first pair
+                # or you can combine the logic (e.g., pick the pair with highest volume).
+                best_pair, volume_24h = None, -1
+                for pair in pairs:
+                    pair_volume = pair.get("volume", {}).get("h24", 0)
+                    if pair_volume > volume_24h:
+                        best_pair, volume_24h = pair, pair_volume
+
+                liquidity_usd = best_pair.get("liquidity", {}).get("usd", 0)
+                snapshots.append((token_address, volume_24h, liquidity_usd))
+
+                candidate = evaluate_token(token_address, volume_24h, liquidity_usd)
+                if candidate is not None:
+                    candidates.append(candidate)
+
+    record_snapshots(snapshots)
+
+    # SCORING: score the whole batch of survivors in one vectorized pass
     valid_tokens = []
-
-    for profile in solana_profiles:
-        token_address = profile.get("tokenAddress", "")
-        if not token_address:
-            continue
-
-        pairs = fetch_pairs_for_token(token_address)
-        if not pairs:
-            # No pair data => skip
-            continue
-
-        # We'll assume we only need to evaluate the "primary" or first pair
-        # or you can combine the logic (e.g., pick the pair with highest volume).
-        best_pair = max(pairs, key=lambda p: p.get("volume", {}).get("h24", 0))
-
-        volume_24h = best_pair.get("volume", {}).get("h24", 0)
-        liquidity_usd = best_pair.get("liquidity", {}).get("usd", 0)
-
-        # BASIC THRESHOLD CHECKS
-        if liquidity_usd < MIN_LIQUIDITY_USD:
-            continue  # fails liquidity
-        # transaction count
-        tx_count_24h = fetch_transaction_count(token_address)
-        if tx_count_24h < MIN_TX_COUNT_24H:
-            continue  # fails tx count
-
-        # DISTRIBUTION & LIQUIDITY LOCK
-        holder_info = fetch_holder_distribution(token_address)
-        top_holders = holder_info.get("topHolders", [])
-        if top_holders:
-            max_holder_pct = max([h["percentage"] for h in top_holders])
-            if max_holder_pct > TOP_HOLDER_MAX_PERCENT:
-                continue  # fails top-holder distribution
-        else:
-            max_holder_pct = 0
-
-        # liquidity lock
-        if REQUIRED_LIQUIDITY_LOCK and not check_liquidity_lock(token_address):
-            continue  # fails liquidity lock
-
-        # H ISTORICAL DATA & SCORING
-        historical_data = fetch_historical_data(token_address)
-        score = compute_token_score(volume_24h, liquidity_usd, tx_count_24h, max_holder_pct, historical_data)
-
-        if score >= MIN_SCORE_THRESHOLD:
+    if candidates:
+        def column(key):
+            return np.fromiter((c[key] for c in candidates), dtype=np.float64, count=len(candidates))
+
+        scores = score_token_batch(
+            column("volume_24h"), column("liquidity_usd"),
+            column("tx_count_24h"), column("top_holder_pct"),
+            column("historical_bonus"),
+        )
+
+        # Keep tokens above the threshold, sorted by descending score
+        passing = np.flatnonzero(scores >= MIN_SCORE_THRESHOLD)
+        for i in passing[np.argsort(-scores[passing], kind="stable")]:
+            token = candidates[i]
             valid_tokens.append({
-                "tokenAddress": token_address,
-                "score": score,
-                "volume_24h": volume_24h,
-                "liquidity_usd": liquidity_usd,
-                "tx_count_24h": tx_count_24h,
-                "top_holder_pct": max_holder_pct
+                "tokenAddress": token["tokenAddress"],
+                "score": float(scores[i]),
+                "volume_24h": token["volume_24h"],
+                "liquidity_usd": token["liquidity_usd"],
+                "tx_count_24h": token["tx_count_24h"],
+                "top_holder_pct": token["top_holder_pct"]
             })
 
-    # Sort final tokens by descending score
-    valid_tokens.sort(key=lambda x: x["score"], reverse=True)
-
-    # Print or return the results
-    print("\n=== ADVANCED FILTERING RESULTS ===")
+    # Print or return the results (built up and written in one go)
+    lines = ["\n=== ADVANCED FILTERING RESULTS ==="]
     if not valid_tokens:
-        print("No tokens passed the advanced filters.")
+        lines.append("No tokens passed the advanced filters.")
     else:
         for idx, t in enumerate(valid_tokens, start=1):
-            print(f"{idx}. {t['tokenAddress']} - Score: {t['score']:.2f}, "
-                  f"Vol: {t['volume_24h']}, Liq: {t['liquidity_usd']}, "
-                  f"TxCount: {t['tx_count_24h']}, TopHolder: {t['top_holder_pct']}%")
+            lines.append(f"{idx}. {t['tokenAddress']} - Score: {t['score']:.2f}, "
+                         f"Vol: {t['volume_24h']}, Liq: {t['liquidity_usd']}, "
+                         f"TxCount: {t['tx_count_24h']}, TopHolder: {t['top_holder_pct']}%")
+    sys.stdout.write("\n".join(lines) + "\n")
 
     return valid_tokens
 
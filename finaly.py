@@ -1,11 +1,24 @@
 import time
 import requests
-import uuid
+import itertools
+import functools
 import threading
 import os
-import json
+import sys
+import logging
+import queue
+import orjson
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; batches are scored with plain NumPy without it
+    njit = None
 
 # --------------------------------------------------
 # 1) CONFIG / CONSTANTS
@@ -14,7 +27,10 @@ from typing import List, Optional
 # Dexscreener endpoint for the latest token profiles
 TOKEN_PROFILES_URL = "https://api.dexscreener.com/token-profiles/latest/v1"
 # Dexscreener endpoint for token pairs
-TOKEN_PAIRS_URL_TEMPLATE = "https://api.dexscreener.com/token-pairs/v1/solana/{tokenAddress}"
+TOKEN_PAIRS_URL_PREFIX = "https://api.dexscreener.com/token-pairs/v1/solana/"  # + tokenAddress
+# Dexscreener endpoint for pairs of up to MAX_TOKENS_PER_REQUEST comma-separated tokens
+TOKEN_PRICES_URL_PREFIX = "https://api.dexscreener.com/latest/dex/tokens/"  # + comma-separated tokenAddresses
+MAX_TOKENS_PER_REQUEST = 30
 
 # Example thresholds (tweak as needed)
 MIN_LIQUIDITY_USD = 10000     # must have at least $10k liquidity
@@ -30,6 +46,10 @@ WEIGHT_HOLDER_DISTRIB = 0.1  # or negative weighting if top holder % is large
 
 # Minimum final score to pass (example)
 MIN_SCORE_THRESHOLD = 2000
+# Only the highest-scoring tokens are returned (main() opens trades for each of them)
+MAX_SELECTED_TOKENS = 10
+# Batches of at least this many tokens are scored with the numba kernel (if installed)
+NUMBA_MIN_BATCH = 256
 
 # Jupiter API
 JUPITER_API_BASE_URL = "https://api.jupiter.xyz"  # Replace with actual Jupiter API base URL
@@ -42,29 +62,57 @@ PHANTOM_WALLET_ADDRESS = os.getenv("PHANTOM_WALLET_ADDRESS")
 # Investment Percentages
 INVESTMENT_PERCENTAGES = [5, 10, 15, 20]
 
+# Concurrent per-token evaluations in advanced_filter_solana_tokens
+MAX_FETCH_WORKERS = 32
+# Dexscreener rate limit for the token-pairs/tokens endpoints (see apis.txt)
+PAIRS_REQUESTS_PER_MINUTE = 300
+# How long (seconds) a Dexscreener response is reused before asking again
+PROFILES_CACHE_TTL = 30
+PAIRS_CACHE_TTL = 15
+# Holder distribution, liquidity lock and history change slowly; re-check them hourly
+TOKEN_INFO_CACHE_TTL = 3600
+# Seconds between price checks of the open trades (a new trade triggers a check right away)
+PRICE_POLL_INTERVAL = 60
+
+# Shared HTTP session: keep-alive connections to Dexscreener are reused across
+# calls and worker threads instead of paying a new TCP+TLS handshake each time.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=64,
+    pool_maxsize=64,
+    max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[429, 500, 502, 503, 504]),
+))
+
+# Status/error messages; logging is thread-safe, so worker threads can use it directly
+logger = logging.getLogger(__name__)
+
 # --------------------------------------------------
 # 2) DATA CLASSES
 # --------------------------------------------------
 
-@dataclass
+# Source of trade ids: sequential ints, unique for the lifetime of the process
+_TRADE_ID_COUNTER = itertools.count(1)
+
+@dataclass(slots=True)
 class Milestone:
     percentage_gain: float  # e.g., 30.0 for 30%
     is_sold: bool = False
     sold_amount: float = 0.0  # USD amount sold at this milestone
 
-@dataclass
+@dataclass(slots=True)
 class Trade:
     token_address: str
     entry_price: float  # USD price at which the token was bought
     investment_amount: float  # USD amount invested
     purchase_levels: List[float]  # e.g., [5, 10, 15, 20] percentages
     stop_loss: float  # Percentage drop from entry_price to trigger stop-loss
-    milestones: List[Milestone] = field(default_factory=lambda: [
+    # Fixed set of take-profit levels; the Milestone objects themselves are updated in place
+    milestones: Tuple[Milestone, ...] = field(default_factory=lambda: (
         Milestone(percentage_gain=30.0),
         Milestone(percentage_gain=65.0),
-        Milestone(percentage_gain=100.0)
-    ])
-    trade_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+        Milestone(percentage_gain=100.0),
+    ))
+    trade_id: int = field(default_factory=lambda: next(_TRADE_ID_COUNTER))
     current_status: str = "OPEN"  # Could be OPEN, STOPPED, COMPLETED
 
     def update_status(self, new_status: str):
@@ -74,6 +122,58 @@ class Trade:
 # 3) PLACEHOLDER FUNCTIONS FOR ADDITIONAL DATA
 # --------------------------------------------------
 
+# TTL caching for the lookups below; TTLCache also backs the Dexscreener response cache
+class TTLCache:
+    """
+    Small thread-safe mapping whose entries expire `ttl` seconds after being stored.
+    When full, expired entries are dropped first, then the oldest insert.
+    """
+    def __init__(self, ttl, maxsize=4096):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.entries = {}
+        self.lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self.lock:
+            entry = self.entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+        return default
+
+    def set(self, key, value):
+        now = time.monotonic()
+        with self.lock:
+            if key not in self.entries and len(self.entries) >= self.maxsize:
+                for stale in [k for k, (expires, _) in self.entries.items() if expires <= now]:
+                    del self.entries[stale]
+                if len(self.entries) >= self.maxsize:
+                    del self.entries[next(iter(self.entries))]
+            self.entries[key] = (now + self.ttl, value)
+
+_MISSING = object()
+
+def ttl_cache(ttl, maxsize=1024):
+    """
+    Memoizes a single-argument function (keyed on token_address) for `ttl` seconds.
+    Exceptions are not cached, so a failed lookup is retried on the next call.
+    """
+    def decorator(func):
+        cache = TTLCache(ttl, maxsize)
+
+        @functools.wraps(func)
+        def wrapper(key):
+            value = cache.get(key, _MISSING)
+            if value is _MISSING:
+                value = func(key)
+                cache.set(key, value)
+            return value
+
+        wrapper.cache = cache
+        return wrapper
+    return decorator
+
+@ttl_cache(ttl=TOKEN_INFO_CACHE_TTL)
 def fetch_holder_distribution(token_address):
     # Placeholder implementation
     data = {
@@ -85,6 +185,7 @@ def fetch_holder_distribution(token_address):
     }
     return data
 
+@ttl_cache(ttl=TOKEN_INFO_CACHE_TTL)
 def check_liquidity_lock(token_address):
     # Placeholder always returns True for demonstration
     return True
@@ -93,6 +194,7 @@ def fetch_transaction_count(token_address):
     # Placeholder returns a static number for demonstration
     return 500
 
+@ttl_cache(ttl=TOKEN_INFO_CACHE_TTL)
 def fetch_historical_data(token_address):
     # Placeholder historical data
     historical = [
@@ -106,13 +208,70 @@ def fetch_historical_data(token_address):
 # 4) HELPER FUNCTIONS FOR DEXSCREENER
 # --------------------------------------------------
 
+class _TokenBucket:
+    """
+    Thread-safe token bucket: allows bursts of up to `capacity` requests,
+    then paces callers to `rate` requests per second.
+    """
+    def __init__(self, capacity, rate):
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = float(capacity)
+        self.last_refill = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+            self.last_refill = now
+            # Reserve a token even if we have to wait for it, so concurrent
+            # callers queue up behind each other instead of all sleeping the same amount.
+            wait = (1 - self.tokens) / self.rate if self.tokens < 1 else 0
+            self.tokens -= 1
+        if wait:
+            time.sleep(wait)
+
+_PAIRS_RATE_LIMITER = _TokenBucket(capacity=PAIRS_REQUESTS_PER_MINUTE, rate=PAIRS_REQUESTS_PER_MINUTE / 60)
+
+# Per-URL (fetched_at, etag, last_modified, parsed body) of the last good response.
+# Entries are kept for an hour so they can still be revalidated after going stale.
+_RESPONSE_CACHE = TTLCache(ttl=3600, maxsize=1024)
+
+def _get_json(url, max_age, rate_limiter=None):
+    """
+    GETs `url` and returns its parsed JSON body, reusing the cached body if it is
+    younger than `max_age` seconds. Otherwise the request carries If-None-Match /
+    If-Modified-Since from the cached response, and a 304 reuses the cached body
+    without downloading or parsing it. Raises on HTTP and JSON errors.
+    """
+    cached = _RESPONSE_CACHE.get(url)
+    if cached and time.monotonic() - cached[0] < max_age:
+        return cached[3]
+
+    headers = {}
+    if cached:
+        if cached[1]:
+            headers["If-None-Match"] = cached[1]
+        if cached[2]:
+            headers["If-Modified-Since"] = cached[2]
+    if rate_limiter is not None:
+        rate_limiter.acquire()
+    resp = _SESSION.get(url, headers=headers, timeout=10)
+    if cached and resp.status_code == 304:
+        _RESPONSE_CACHE.set(url, (time.monotonic(), cached[1], cached[2], cached[3]))
+        return cached[3]
+
+    resp.raise_for_status()
+    body = orjson.loads(resp.content)
+    _RESPONSE_CACHE.set(url, (time.monotonic(), resp.headers.get("ETag"), resp.headers.get("Last-Modified"), body))
+    return body
+
 def fetch_solana_token_profiles():
     try:
-        response = requests.get(TOKEN_PROFILES_URL, timeout=10)
-        response.raise_for_status()
-        all_profiles = response.json()
-    except requests.RequestException as e:
-        print(f"[ERROR] Could not fetch token profiles: {e}")
+        all_profiles = _get_json(TOKEN_PROFILES_URL, PROFILES_CACHE_TTL)
+    except (requests.RequestException, orjson.JSONDecodeError) as e:
+        logger.error(f"Could not fetch token profiles: {e}")
         return []
 
     # Filter to only Solana
@@ -120,110 +279,173 @@ def fetch_solana_token_profiles():
     return solana_profiles
 
 def fetch_pairs_for_token(token_address):
-    url = TOKEN_PAIRS_URL_TEMPLATE.format(tokenAddress=token_address)
+    url = TOKEN_PAIRS_URL_PREFIX + token_address
     try:
-        resp = requests.get(url, timeout=10)
-        resp.raise_for_status()
-        return resp.json()  # Usually a list of pairs
-    except requests.RequestException as e:
-        print(f"[ERROR] Failed to fetch pairs for {token_address}: {e}")
+        return _get_json(url, PAIRS_CACHE_TTL, _PAIRS_RATE_LIMITER)  # Usually a list of pairs
+    except (requests.RequestException, orjson.JSONDecodeError) as e:
+        logger.error(f"Failed to fetch pairs for {token_address}: {e}")
         return []
 
 # --------------------------------------------------
 # 5) SCORING / ANALYSIS
 # --------------------------------------------------
 
-def compute_token_score(volume_24h, liquidity_usd, tx_count, top_holder_pct, historical_data=None):
-    base_score = (
-        (WEIGHT_LIQUIDITY * liquidity_usd) +
-        (WEIGHT_VOLUME    * volume_24h) +
-        (WEIGHT_TX_COUNT  * tx_count) -
-        (WEIGHT_HOLDER_DISTRIB * top_holder_pct)
-    )
-
-    # Optionally incorporate historical growth
-    if historical_data:
-        bonus = compute_historical_bonus(historical_data)
-        base_score += bonus
-
-    return base_score
+# Weight vector matching the column order of compute_token_scores' metrics matrix.
+# The weights are fixed for the life of the process, so it is built once here.
+_SCORE_WEIGHTS = np.array([WEIGHT_LIQUIDITY, WEIGHT_VOLUME, WEIGHT_TX_COUNT, -WEIGHT_HOLDER_DISTRIB], dtype=np.float64)
+
+if njit is not None:
+    # numba freezes the WEIGHT_* globals into the compiled code as constants
+    @njit(cache=True, fastmath=True)
+    def _score_kernel(liquidity_usd, volume_24h, tx_count, top_holder_pct, volume_first, volume_last):
+        scores = np.empty(liquidity_usd.shape[0])
+        for i in range(liquidity_usd.shape[0]):
+            score = (
+                (WEIGHT_LIQUIDITY * liquidity_usd[i]) +
+                (WEIGHT_VOLUME    * volume_24h[i]) +
+                (WEIGHT_TX_COUNT  * tx_count[i]) -
+                (WEIGHT_HOLDER_DISTRIB * top_holder_pct[i])
+            )
+            if volume_last[i] > volume_first[i]:
+                score += 100.0
+            scores[i] = score
+        return scores
+
+def compute_token_scores(liquidity_usd, volume_24h, tx_count, top_holder_pct, volume_first, volume_last):
+    """
+    Scores a batch of tokens at once. Every argument is a float64 array with one
+    entry per token; volume_first/volume_last are the oldest and newest historical
+    volumes, and tokens whose volume grew get a +100 bonus.
+    Large batches use a compiled numba kernel when numba is installed.
+    """
+    if njit is not None and len(liquidity_usd) >= NUMBA_MIN_BATCH:
+        return _score_kernel(liquidity_usd, volume_24h, tx_count, top_holder_pct, volume_first, volume_last)
 
-def compute_historical_bonus(historical_data):
-    if len(historical_data) < 2:
-        return 0
-    volumes = [day["volume"] for day in historical_data]
-    if volumes[-1] > volumes[0]:
-        return 100
-    return 0
+    metrics = np.stack([liquidity_usd, volume_24h, tx_count, top_holder_pct], axis=1)
+    scores = metrics @ _SCORE_WEIGHTS
+    scores += np.where(volume_last > volume_first, 100.0, 0.0)
+    return scores
 
 # --------------------------------------------------
 # 6) FILTERING LOGIC
 # --------------------------------------------------
 
+def best_pair_metrics(pairs):
+    """
+    Returns (volume_24h, liquidity_usd) of the highest-volume pair,
+    or (0, 0) if there are no pairs.
+    """
+    # Highest-volume pair in one pass; its volume is kept rather than looked up again
+    best_pair, volume_24h = None, -1
+    for pair in pairs:
+        pair_volume = pair.get("volume", {}).get("h24", 0) or 0
+        if pair_volume > volume_24h:
+            best_pair, volume_24h = pair, pair_volume
+
+    if best_pair is None:
+        return 0, 0
+    return volume_24h, best_pair.get("liquidity", {}).get("usd", 0)
+
+def evaluate_token(token_address, volume_24h, liquidity_usd):
+    """
+    Runs the remaining threshold checks for a token that already passed the
+    liquidity check on its best pair.
+    Returns the metrics needed for scoring, or None if the token fails a check.
+    """
+    tx_count_24h = fetch_transaction_count(token_address)
+    if tx_count_24h < MIN_TX_COUNT_24H:
+        return None  # fails tx count
+
+    holder_info = fetch_holder_distribution(token_address)
+    top_holders = holder_info.get("topHolders", [])
+    max_holder_pct = max((h["percentage"] for h in top_holders), default=0)
+    if max_holder_pct > TOP_HOLDER_MAX_PERCENT:
+        return None  # fails top-holder distribution
+
+    if REQUIRED_LIQUIDITY_LOCK and not check_liquidity_lock(token_address):
+        return None  # fails liquidity lock
+
+    # Oldest/newest historical volume; with fewer than two records there is no trend
+    historical_data = fetch_historical_data(token_address)
+    if len(historical_data) >= 2:
+        volume_first, volume_last = historical_data[0]["volume"], historical_data[-1]["volume"]
+    else:
+        volume_first = volume_last = 0
+
+    return {
+        "tokenAddress": token_address,
+        "volume_24h": volume_24h,
+        "liquidity_usd": liquidity_usd,
+        "tx_count_24h": tx_count_24h,
+        "top_holder_pct": max_holder_pct,
+        "volume_first": volume_first,
+        "volume_last": volume_last,
+    }
+
 def advanced_filter_solana_tokens():
     solana_profiles = fetch_solana_token_profiles()
     print(f"Found {len(solana_profiles)} Solana token profiles.")
 
-    valid_tokens = []
-
-    for profile in solana_profiles:
-        token_address = profile.get("tokenAddress", "")
-        if not token_address:
-            continue
-
-        pairs = fetch_pairs_for_token(token_address)
-        if not pairs:
-            continue
-
-        best_pair = max(pairs, key=lambda p: p.get("volume", {}).get("h24", 0))
-
-        volume_24h = best_pair.get("volume", {}).get("h24", 0)
-        liquidity_usd = best_pair.get("liquidity", {}).get("usd", 0)
-
-        if liquidity_usd < MIN_LIQUIDITY_USD:
-            continue  # fails liquidity
-
-        tx_count_24h = fetch_transaction_count(token_address)
-        if tx_count_24h < MIN_TX_COUNT_24H:
-            continue  # fails tx count
-
-        holder_info = fetch_holder_distribution(token_address)
-        top_holders = holder_info.get("topHolders", [])
-        if top_holders:
-            max_holder_pct = max([h["percentage"] for h in top_holders])
-            if max_holder_pct > TOP_HOLDER_MAX_PERCENT:
-                continue  # fails top-holder distribution
-        else:
-            max_holder_pct = 0
+    token_addresses = [p.get("tokenAddress", "") for p in solana_profiles]
+    token_addresses = [addr for addr in token_addresses if addr]
+
+    # Lookups are dominated by network I/O, so run them across a thread pool
+    # sharing the pooled session.
+    with ThreadPoolExecutor(max_workers=MAX_FETCH_WORKERS) as executor:
+        # Phase 1: pairs for every token, then the liquidity check for all of them at once
+        metrics = [best_pair_metrics(pairs) for pairs in executor.map(fetch_pairs_for_token, token_addresses)]
+        liquidities = np.fromiter((m[1] for m in metrics), dtype=np.float64, count=len(metrics))
+        survivors = np.flatnonzero(liquidities >= MIN_LIQUIDITY_USD)
+
+        # Phase 2: tx count / holders / lock / history only for tokens that passed
+        results = executor.map(
+            evaluate_token,
+            [token_addresses[i] for i in survivors],
+            [metrics[i][0] for i in survivors],
+            [metrics[i][1] for i in survivors],
+        )
+        candidates = [token for token in results if token is not None]
 
-        if REQUIRED_LIQUIDITY_LOCK and not check_liquidity_lock(token_address):
-            continue  # fails liquidity lock
+    # Score all surviving tokens in one vectorized pass
+    valid_tokens = []
+    if candidates:
+        def column(key):
+            return np.fromiter((c[key] for c in candidates), dtype=np.float64, count=len(candidates))
 
-        historical_data = fetch_historical_data(token_address)
-        score = compute_token_score(volume_24h, liquidity_usd, tx_count_24h, max_holder_pct, historical_data)
+        scores = compute_token_scores(
+            column("liquidity_usd"), column("volume_24h"), column("tx_count_24h"),
+            column("top_holder_pct"), column("volume_first"), column("volume_last"),
+        )
 
-        if score >= MIN_SCORE_THRESHOLD:
+        # Keep the top MAX_SELECTED_TOKENS tokens above the threshold, sorted by descending
+        # score; argpartition picks them in linear time so only those K get sorted.
+        passing = np.flatnonzero(scores >= MIN_SCORE_THRESHOLD)
+        if len(passing) > MAX_SELECTED_TOKENS:
+            top = np.argpartition(-scores[passing], MAX_SELECTED_TOKENS - 1)[:MAX_SELECTED_TOKENS]
+            passing = passing[np.sort(top)]  # back in input order, so ties keep their order
+        for i in passing[np.argsort(-scores[passing], kind="stable")]:
+            token = candidates[i]
             valid_tokens.append({
-                "tokenAddress": token_address,
-                "score": score,
-                "volume_24h": volume_24h,
-                "liquidity_usd": liquidity_usd,
-                "tx_count_24h": tx_count_24h,
-                "top_holder_pct": max_holder_pct
+                "tokenAddress": token["tokenAddress"],
+                "score": float(scores[i]),
+                "volume_24h": token["volume_24h"],
+                "liquidity_usd": token["liquidity_usd"],
+                "tx_count_24h": token["tx_count_24h"],
+                "top_holder_pct": token["top_holder_pct"]
             })
 
-    # Sort final tokens by descending score
-    valid_tokens.sort(key=lambda x: x["score"], reverse=True)
-
-    # Print or return the results
-    print("\n=== ADVANCED FILTERING RESULTS ===")
+    # Print or return the results (built up and written in one go)
+    lines = ["\n=== ADVANCED FILTERING RESULTS ==="]
     if not valid_tokens:
-        print("No tokens passed the advanced filters.")
+        lines.append("No tokens passed the advanced filters.")
     else:
-        for idx, t in enumerate(valid_tokens, start=1):
-            print(f"{idx}. {t['tokenAddress']} - Score: {t['score']:.2f}, "
-                  f"Vol: {t['volume_24h']}, Liq: {t['liquidity_usd']}, "
-                  f"TxCount: {t['tx_count_24h']}, TopHolder: {t['top_holder_pct']}%")
+        lines.extend(
+            f"{idx}. {t['tokenAddress']} - Score: {t['score']:.2f}, "
+            f"Vol: {t['volume_24h']}, Liq: {t['liquidity_usd']}, "
+            f"TxCount: {t['tx_count_24h']}, TopHolder: {t['top_holder_pct']}%"
+            for idx, t in enumerate(valid_tokens, start=1)
+        )
+    sys.stdout.write("\n".join(lines) + "\n")
 
     return valid_tokens
 
@@ -232,28 +454,61 @@ def advanced_filter_solana_tokens():
 # --------------------------------------------------
 
 class TradeManager:
+    """
+    Trades are handed over by add_trade through a queue; active_trades is only
+    touched by the monitor_trades thread, so no lock is needed around it.
+    """
     def __init__(self):
         self.active_trades = {}
-        self.lock = threading.Lock()
+        # Trades added from other threads, waiting to be picked up by the monitor
+        self.pending = queue.SimpleQueue()
+        # Immutable copy of active_trades.values(), rebuilt whenever the dict changes
+        # so the monitor can iterate it while trades are being removed
+        self.snapshot = ()
 
     def add_trade(self, trade: Trade):
-        with self.lock:
-            self.active_trades[trade.trade_id] = trade
-            print(f"[INFO] Trade {trade.trade_id} added.")
-
-    def remove_trade(self, trade_id: str):
-        with self.lock:
-            if trade_id in self.active_trades:
-                del self.active_trades[trade_id]
-                print(f"[INFO] Trade {trade_id} removed.")
+        # Safe to call from any thread; also wakes the monitor so the trade is checked right away
+        self.pending.put(trade)
+        logger.info(f"Trade {trade.trade_id} added.")
+
+    def remove_trade(self, trade_id: int):
+        if trade_id in self.active_trades:
+            del self.active_trades[trade_id]
+            self.snapshot = tuple(self.active_trades.values())
+            logger.info(f"Trade {trade_id} removed.")
+
+    def collect_new_trades(self, first: Optional[Trade] = None):
+        """
+        Moves `first` (if given) and every trade still queued into active_trades.
+        """
+        new_trades = [first] if first is not None else []
+        while True:
+            try:
+                new_trades.append(self.pending.get_nowait())
+            except queue.Empty:
+                break
+        if new_trades:
+            for trade in new_trades:
+                self.active_trades[trade.trade_id] = trade
+            self.snapshot = tuple(self.active_trades.values())
 
     def monitor_trades(self):
+        new_trade = None
         while True:
-            with self.lock:
-                for trade_id, trade in list(self.active_trades.items()):
-                    current_price = fetch_current_price(trade.token_address)  # Implement this function
+            self.collect_new_trades(new_trade)
+            snapshot = self.snapshot
+            token_addresses = list({trade.token_address for trade in snapshot})
+            # One batched price lookup per cycle instead of one request per trade
+            prices = fetch_current_prices(token_addresses) if token_addresses else {}
+            for trade in snapshot:
+                current_price = prices.get(trade.token_address)
+                if current_price:  # no price this cycle => don't act on it
                     self.evaluate_trade(trade, current_price)
-            time.sleep(60)  # Wait for 1 minute before next check
+            # Sleep until the next check is due or a new trade comes in
+            try:
+                new_trade = self.pending.get(timeout=PRICE_POLL_INTERVAL)
+            except queue.Empty:
+                new_trade = None
 
     def evaluate_trade(self, trade: Trade, current_price: float):
         if trade.current_status != "OPEN":
@@ -262,7 +517,7 @@ class TradeManager:
         pct_change = ((current_price - trade.entry_price) / trade.entry_price) * 100
 
         if pct_change <= -trade.stop_loss:
-            print(f"[ALERT] Trade {trade.trade_id} hit stop-loss. Liquidating position.")
+            logger.warning(f"Trade {trade.trade_id} hit stop-loss. Liquidating position.")
             self.liquidate_trade(trade, reason="STOP_LOSS")
             return
 
@@ -277,12 +532,12 @@ class TradeManager:
         if success:
             milestone.is_sold = True
             milestone.sold_amount = amount
-            print(f"[INFO] Sold ${amount} of {trade.token_address} at milestone {milestone.percentage_gain}%.")
+            logger.info(f"Sold ${amount} of {trade.token_address} at milestone {milestone.percentage_gain}%.")
 
             if all(m.is_sold for m in trade.milestones):
                 trade.update_status("COMPLETED")
                 self.remove_trade(trade.trade_id)
-                print(f"[INFO] Trade {trade.trade_id} completed.")
+                logger.info(f"Trade {trade.trade_id} completed.")
 
     def liquidate_trade(self, trade: Trade, reason: str):
         amount = trade.investment_amount
@@ -290,7 +545,7 @@ class TradeManager:
         if success:
             trade.update_status("STOPPED")
             self.remove_trade(trade.trade_id)
-            print(f"[INFO] Trade {trade.trade_id} liquidated due to {reason}.")
+            logger.info(f"Trade {trade.trade_id} liquidated due to {reason}.")
 
 # --------------------------------------------------
 # 8) JUPITER API INTEGRATION
@@ -308,14 +563,14 @@ def execute_buy_order(token_address: str, amount_usd: float) -> Optional[float]:
     }
 
     try:
-        response = requests.post(f"{JUPITER_API_BASE_URL}/trade/buy", headers=headers, data=json.dumps(payload))
+        response = _SESSION.post(f"{JUPITER_API_BASE_URL}/trade/buy", headers=headers, data=orjson.dumps(payload), timeout=10)
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
         entry_price = data.get("executedPriceUSD")
-        print(f"[SUCCESS] Bought {token_address} at ${entry_price} per token.")
+        logger.info(f"Bought {token_address} at ${entry_price} per token.")
         return entry_price
-    except requests.RequestException as e:
-        print(f"[ERROR] Buy order failed: {e}")
+    except (requests.RequestException, orjson.JSONDecodeError) as e:
+        logger.error(f"Buy order failed: {e}")
         return None
 
 def execute_sell_order(token_address: str, amount_usd: float) -> bool:
@@ -330,50 +585,83 @@ def execute_sell_order(token_address: str, amount_usd: float) -> bool:
     }
 
     try:
-        response = requests.post(f"{JUPITER_API_BASE_URL}/trade/sell", headers=headers, data=json.dumps(payload))
+        response = _SESSION.post(f"{JUPITER_API_BASE_URL}/trade/sell", headers=headers, data=orjson.dumps(payload), timeout=10)
         response.raise_for_status()
-        print(f"[SUCCESS] Sold ${amount_usd} of {token_address}.")
+        logger.info(f"Sold ${amount_usd} of {token_address}.")
         return True
     except requests.RequestException as e:
-        print(f"[ERROR] Sell order failed: {e}")
+        logger.error(f"Sell order failed: {e}")
         return False
 
 # --------------------------------------------------
 # 9) PHANTOM WALLET INTEGRATION
 # --------------------------------------------------
 
-from web3 import Web3
-
 SOLANA_RPC_URL = "https://api.mainnet-beta.solana.com"  # Replace with actual Solana RPC URL
-w3 = Web3(Web3.HTTPProvider(SOLANA_RPC_URL))
+LAMPORTS_PER_SOL = 1_000_000_000
 
 def get_wallet_balance():
+    """
+    Returns the wallet's SOL balance via the Solana JSON-RPC getBalance method (0 on failure).
+    """
+    payload = {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "getBalance",
+        "params": [PHANTOM_WALLET_ADDRESS]
+    }
     try:
-        balance = w3.eth.get_balance(PHANTOM_WALLET_ADDRESS)
-        return w3.fromWei(balance, 'ether')
-    except Exception as e:
-        print(f"[ERROR] Could not fetch wallet balance: {e}")
+        response = _SESSION.post(SOLANA_RPC_URL, headers={"Content-Type": "application/json"},
+                                 data=orjson.dumps(payload), timeout=10)
+        response.raise_for_status()
+        data = orjson.loads(response.content)
+        if "error" in data:
+            raise ValueError(data["error"].get("message", data["error"]))
+        return data["result"]["value"] / LAMPORTS_PER_SOL
+    except (requests.RequestException, ValueError, KeyError) as e:
+        logger.error(f"Could not fetch wallet balance: {e}")
         return 0
 
 # --------------------------------------------------
 # 10) HELPER FUNCTIONS
 # --------------------------------------------------
 
+def fetch_current_prices(token_addresses: List[str]) -> Dict[str, float]:
+    """
+    Fetch the current USD prices of several tokens, MAX_TOKENS_PER_REQUEST per request.
+    Each token is priced from its most liquid pair where it is the base token.
+    Tokens that couldn't be priced are left out of the returned dict.
+    """
+    prices = {}
+    best_liquidity = {}
+    for start in range(0, len(token_addresses), MAX_TOKENS_PER_REQUEST):
+        chunk = token_addresses[start:start + MAX_TOKENS_PER_REQUEST]
+        wanted = set(chunk)
+        try:
+            url = TOKEN_PRICES_URL_PREFIX + ",".join(chunk)
+            _PAIRS_RATE_LIMITER.acquire()
+            response = _SESSION.get(url, timeout=10)
+            response.raise_for_status()
+            pairs = orjson.loads(response.content).get("pairs") or []
+        except (requests.RequestException, ValueError) as e:
+            logger.error(f"Could not fetch current prices for {len(chunk)} tokens: {e}")
+            continue
+
+        for pair in pairs:
+            address = pair.get("baseToken", {}).get("address")
+            if address not in wanted or not pair.get("priceUsd"):
+                continue
+            liquidity = pair.get("liquidity", {}).get("usd", 0)
+            if liquidity >= best_liquidity.get(address, -1):
+                best_liquidity[address] = liquidity
+                prices[address] = float(pair["priceUsd"])
+    return prices
+
 def fetch_current_price(token_address: str) -> float:
     """
-    Fetch the current price of the token in USD.
-    Implement this function based on your data source.
+    Fetch the current price of the token in USD (0.0 if it couldn't be fetched).
     """
-    try:
-        url = f"https://api.dexscreener.com/latest/dex/tokens/solana/{token_address}"
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-        price = float(data['price']['currentPrice'])  # Adjust based on actual response structure
-        return price
-    except Exception as e:
-        print(f"[ERROR] Could not fetch current price for {token_address}: {e}")
-        return 0.0
+    return fetch_current_prices([token_address]).get(token_address, 0.0)
 
 def calculate_investment_amount(total_budget: float, percentage: float) -> float:
     return (percentage / 100) * total_budget
@@ -397,6 +685,8 @@ def setup_trade(token_address: str, investment_percentage: float, total_budget:
 # --------------------------------------------------
 
 def main():
+    logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
+
     trade_manager = TradeManager()
     monitoring_thread = threading.Thread(target=trade_manager.monitor_trades, daemon=True)
     monitoring_thread.start()